@@ -7,17 +7,28 @@ import sys
 import pandas as pd
 from tabulate import tabulate
 
-from config import DATA_DIR, OUTPUT_DIR
+from config import DATA_DIR, OUTPUT_DIR, BUDGET_SEPARATORS
+from scenarios import (
+    FEATURE_COLUMNS,
+    compute_features,
+    load_scenarios,
+    evaluate_scenarios,
+    to_json_records,
+)
+from validate import validate, display_report, save_report
 
 
 def load_data():
-    """CSVから店舗データを読み込む。"""
+    """CSVから店舗データを読み込み、検証済みの行を返す。"""
     csv_path = DATA_DIR / "restaurants.csv"
     if not csv_path.exists():
         print(f"エラー: {csv_path} が見つかりません。先に collect.py を実行してください。")
         sys.exit(1)
     df = pd.read_csv(csv_path)
     print(f"データ読み込み: {len(df)} 件")
+    df, quarantined, report = validate(df)
+    display_report(report)
+    save_report(report, quarantined)
     return df
 
 
@@ -32,7 +43,7 @@ def parse_budget_range(budget_str):
 
     # 全角/半角チルダ、ハイフンに対応
     budget_str = budget_str.replace("円", "").strip()
-    parts = re.split(r"[～〜~\-ー]", budget_str)
+    parts = re.split(f"[{BUDGET_SEPARATORS}]", budget_str)
 
     values = []
     for part in parts:
@@ -111,22 +122,12 @@ def compute_ranking(df):
     """人気店ランキングを算出する。
 
     スコア = APIおすすめ順位(0.4) + 席数(0.3) + ジャンル人気度(0.3)
+    特徴量列が無ければ scenarios.compute_features で算出する。
     """
-    df = df.copy()
-
-    # APIおすすめ順位スコア (index順=おすすめ順、上位ほど高スコア)
-    n = len(df)
-    df["rank_score"] = [(n - i) / n for i in range(n)]
-
-    # 席数スコア (正規化)
-    df["capacity_num"] = pd.to_numeric(df["capacity"], errors="coerce").fillna(0)
-    cap_max = df["capacity_num"].max()
-    df["capacity_score"] = df["capacity_num"] / cap_max if cap_max > 0 else 0
-
-    # ジャンル人気度スコア (そのジャンルの店舗数 / 最多ジャンル店舗数)
-    genre_counts = df["genre"].value_counts()
-    genre_max = genre_counts.max() if len(genre_counts) > 0 else 1
-    df["genre_popularity"] = df["genre"].map(genre_counts) / genre_max
+    if not set(FEATURE_COLUMNS).issubset(df.columns):
+        df = compute_features(df)
+    else:
+        df = df.copy()
 
     # 総合スコア
     df["score"] = (
@@ -137,7 +138,7 @@ def compute_ranking(df):
 
     # 全体Top20
     top20 = df.nlargest(20, "score")[
-        ["name", "genre", "budget_name", "capacity_num", "score", "access", "budget_mid"]
+        ["id", "name", "genre", "budget_name", "capacity_num", "score", "access", "budget_mid"]
     ].copy()
     top20["score"] = top20["score"].round(3)
     top20["rank"] = range(1, len(top20) + 1)
@@ -156,7 +157,7 @@ def compute_ranking(df):
             ranking_by_price[label] = []
             continue
         top = seg_df.nlargest(min(20, len(seg_df)), "score")[
-            ["name", "genre", "budget_name", "capacity_num", "score", "access", "budget_mid"]
+            ["id", "name", "genre", "budget_name", "capacity_num", "score", "access", "budget_mid"]
         ].copy()
         top["score"] = top["score"].round(3)
         top["rank"] = range(1, len(top) + 1)
@@ -200,19 +201,21 @@ def display_results(stats, genre_stats, top20):
     )
 
 
-def save_results(stats, genre_stats, top20, ranking_by_price):
+def save_results(stats, genre_stats, top20, ranking_by_price, scenario_rankings=None):
     """分析結果をJSONファイルに保存する。"""
-    cols = ["rank", "name", "genre", "budget_name", "capacity_num", "score", "access"]
+    cols = ["rank", "id", "name", "genre", "budget_name", "capacity_num", "score", "access"]
+
     results = {
         "budget_stats": {k: v for k, v in stats.items() if k != "budget_distribution"},
         "budget_distribution": stats.get("budget_distribution", []),
         "genre_stats": genre_stats,
-        "ranking": top20[cols].to_dict(orient="records"),
+        "ranking": to_json_records(top20, cols),
         "ranking_by_price": {
-            label: df_seg[cols].to_dict(orient="records")
+            label: to_json_records(df_seg, cols)
             for label, df_seg in ranking_by_price.items()
             if len(df_seg) > 0
         },
+        "scenario_rankings": scenario_rankings or {},
     }
     json_path = OUTPUT_DIR / "analysis_results.json"
     with open(json_path, "w", encoding="utf-8") as f:
@@ -225,6 +228,12 @@ if __name__ == "__main__":
     df = load_data()
     df, budget_stats = analyze_budget(df)
     genre_stats = analyze_genre(df)
+    df = compute_features(df)
     top20, ranking_by_price = compute_ranking(df)
     display_results(budget_stats, genre_stats, top20)
-    save_results(budget_stats, genre_stats, top20, ranking_by_price)
+
+    # シナリオ別ランキング
+    scenarios, top_n = load_scenarios()
+    scenario_rankings = evaluate_scenarios(df, scenarios, top_n)
+
+    save_results(budget_stats, genre_stats, top20, ranking_by_price, scenario_rankings)
@@ -0,0 +1,239 @@
+"""店舗写真のダウンロード・サムネイル生成
+
+restaurants.csv の photo URL を並列ダウンロードし、内容ハッシュ (SHA-256) を
+ファイル名とするキャッシュに保存する。キャッシュ済みの写真からサムネイルを
+プロセスプールで生成して docs/thumbs/ に書き出し、マップのポップアップや
+ランキング表から参照するマニフェスト (docs/thumbs/manifest.json) を作成する。
+
+再実行時は写真URLが前回から変わった店舗・新規店舗のみを取得する。
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from PIL import Image, features
+
+from config import (
+    DATA_DIR,
+    PHOTO_CACHE_DIR,
+    THUMBS_DIR,
+    THUMBS_MANIFEST_PATH,
+    PHOTO_DOWNLOAD_WORKERS,
+    THUMBNAIL_SIZE,
+)
+
+MANIFEST_NAME = THUMBS_MANIFEST_PATH.name
+
+
+def load_manifest(thumbs_dir=THUMBS_DIR):
+    """サムネイルマニフェスト {店舗ID: {photo, sha256, thumb}} を読み込む。
+
+    マニフェストが無い場合は空の dict を返す。thumb はサムネイル未生成なら None。
+    """
+    path = thumbs_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, thumbs_dir=THUMBS_DIR):
+    """サムネイルマニフェストを保存する。"""
+    path = thumbs_dir / MANIFEST_NAME
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"マニフェスト保存: {path}")
+    return path
+
+
+def cache_path(digest, cache_dir=PHOTO_CACHE_DIR):
+    """内容ハッシュに対応するキャッシュファイルのパスを返す。"""
+    return cache_dir / digest[:2] / digest
+
+
+def download_photo(url, cache_dir=PHOTO_CACHE_DIR, timeout=30):
+    """写真を1枚ダウンロードしてキャッシュに保存し、SHA-256 を返す。
+
+    同じ内容のファイルが既にキャッシュにあれば書き込みを省略する。
+    同じ内容の写真を複数スレッドが同時に保存しても衝突しないよう、
+    一時ファイルはダウンロードごとに別名で作成する。
+    """
+    resp = requests.get(url, timeout=timeout)
+    resp.raise_for_status()
+    content = resp.content
+    digest = hashlib.sha256(content).hexdigest()
+
+    path = cache_path(digest, cache_dir)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+            tmp.write(content)
+        # 他スレッドが先に同じ内容を保存していても上書きで問題ない
+        os.replace(tmp.name, path)
+    return digest
+
+
+def thumbnail_format():
+    """サムネイル形式 (拡張子, PIL形式名) を返す。WebP 非対応環境では JPEG。"""
+    if features.check("webp"):
+        return "webp", "WEBP"
+    return "jpg", "JPEG"
+
+
+def make_thumbnail(src, dest, size=THUMBNAIL_SIZE, fmt="WEBP"):
+    """キャッシュ済み写真からサムネイルを生成する。
+
+    プロセスプールから呼び出すためトップレベル関数としている。
+    """
+    with Image.open(src) as img:
+        img = img.convert("RGB")
+        img.thumbnail(size)
+        tmp_dest = dest.with_name(dest.name + ".tmp")
+        img.save(tmp_dest, format=fmt, quality=80)
+    tmp_dest.replace(dest)
+    return dest
+
+
+def plan_downloads(df, manifest, cache_dir=PHOTO_CACHE_DIR):
+    """新規または写真URLが変わった店舗の (店舗ID, URL) リストを返す。"""
+    targets = []
+    for shop_id, url in zip(df["id"], df["photo"]):
+        if not isinstance(url, str) or not url:
+            continue
+        entry = manifest.get(shop_id)
+        if (
+            entry
+            and entry.get("photo") == url
+            and cache_path(entry["sha256"], cache_dir).exists()
+        ):
+            continue
+        targets.append((shop_id, url))
+    return targets
+
+
+def fetch_photos(targets, cache_dir=PHOTO_CACHE_DIR, workers=PHOTO_DOWNLOAD_WORKERS):
+    """写真を並列ダウンロードし {店舗ID: SHA-256} を返す。
+
+    同じURLは1回だけ取得する。失敗した店舗は警告を表示して結果から除外する。
+    """
+    digests = {}
+    if not targets:
+        return digests
+
+    shops_by_url = {}
+    for shop_id, url in targets:
+        shops_by_url.setdefault(url, []).append(shop_id)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(download_photo, url, cache_dir): shop_ids
+            for url, shop_ids in shops_by_url.items()
+        }
+        for future, shop_ids in futures.items():
+            try:
+                digest = future.result()
+            except (requests.RequestException, OSError) as e:
+                print(f"  警告: 写真取得に失敗しました ({', '.join(shop_ids)}): {e}")
+                continue
+            for shop_id in shop_ids:
+                digests[shop_id] = digest
+    return digests
+
+
+def build_thumbnails(digests, cache_dir=PHOTO_CACHE_DIR, thumbs_dir=THUMBS_DIR):
+    """未生成のサムネイルをプロセスプールで生成し {SHA-256: 相対パス} を返す。
+
+    生成に失敗した写真は結果に含めない (次回実行時にキャッシュから再生成する)。
+    """
+    ext, fmt = thumbnail_format()
+    thumbs = {}
+    jobs = []
+    for digest in set(digests):
+        dest = thumbs_dir / f"{digest}.{ext}"
+        if dest.exists():
+            thumbs[digest] = f"{thumbs_dir.name}/{dest.name}"
+        else:
+            jobs.append((digest, cache_path(digest, cache_dir), dest))
+
+    created = 0
+    if jobs:
+        with ProcessPoolExecutor() as executor:
+            futures = {
+                executor.submit(make_thumbnail, src, dest, THUMBNAIL_SIZE, fmt): (digest, dest)
+                for digest, src, dest in jobs
+            }
+            for future, (digest, dest) in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"  警告: サムネイル生成に失敗しました ({digest[:12]}): {e}")
+                    continue
+                thumbs[digest] = f"{thumbs_dir.name}/{dest.name}"
+                created += 1
+    print(
+        f"サムネイル生成: {created} 件"
+        f" (既存 {len(thumbs) - created} 件, 失敗 {len(jobs) - created} 件)"
+    )
+    return thumbs
+
+
+def remove_stale_thumbnails(manifest, thumbs_dir=THUMBS_DIR):
+    """マニフェストから参照されなくなったサムネイルを docs/thumbs/ から削除する。"""
+    referenced = {entry["thumb"].split("/")[-1] for entry in manifest.values() if entry.get("thumb")}
+    removed = 0
+    for path in thumbs_dir.iterdir():
+        if path.name == MANIFEST_NAME or path.name in referenced or not path.is_file():
+            continue
+        path.unlink()
+        removed += 1
+    if removed:
+        print(f"不要なサムネイル削除: {removed} 件")
+    return removed
+
+
+def build_assets(df, cache_dir=PHOTO_CACHE_DIR, thumbs_dir=THUMBS_DIR,
+                 workers=PHOTO_DOWNLOAD_WORKERS):
+    """写真ダウンロードからマニフェスト保存までを実行する。
+
+    サムネイル生成に失敗した店舗も thumb=None でマニフェストに残し、
+    次回実行時に写真を再ダウンロードしないようにする。
+    """
+    manifest = load_manifest(thumbs_dir)
+    targets = plan_downloads(df, manifest, cache_dir)
+    print(f"写真ダウンロード: {len(targets)} 件 (キャッシュ済み分はスキップ)")
+    fetched = fetch_photos(targets, cache_dir, workers)
+
+    # 現在のCSVに存在する店舗のみを残す
+    photos = dict(zip(df["id"], df["photo"]))
+    entries = {}
+    for shop_id, url in photos.items():
+        if shop_id in fetched:
+            entries[shop_id] = {"photo": url, "sha256": fetched[shop_id]}
+        elif shop_id in manifest and manifest[shop_id].get("photo") == url:
+            entries[shop_id] = manifest[shop_id]
+
+    thumbs = build_thumbnails({e["sha256"] for e in entries.values()}, cache_dir, thumbs_dir)
+    manifest = {
+        shop_id: {**entry, "thumb": thumbs.get(entry["sha256"])}
+        for shop_id, entry in entries.items()
+    }
+    save_manifest(manifest, thumbs_dir)
+    remove_stale_thumbnails(manifest, thumbs_dir)
+    return manifest
+
+
+if __name__ == "__main__":
+    csv_path = DATA_DIR / "restaurants.csv"
+    if not csv_path.exists():
+        print(f"エラー: {csv_path} が見つかりません。先に collect.py を実行してください。")
+        sys.exit(1)
+
+    df = pd.read_csv(csv_path)
+    print(f"データ読み込み: {len(df)} 件")
+    build_assets(df)
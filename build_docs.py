@@ -2,13 +2,13 @@
 
 output/ のチャートPNGを docs/charts/ にコピーし、
 マップHTMLを docs/map.html にコピーし、
-分析結果JSONを index.html に埋め込む。
+分析結果JSONとサムネイルマニフェストを index.html に埋め込む。
 """
 
 import json
 import shutil
 
-from config import OUTPUT_DIR, DOCS_DIR, CHARTS_DIR
+from config import OUTPUT_DIR, DOCS_DIR, CHARTS_DIR, THUMBS_MANIFEST_PATH
 
 
 def build():
@@ -32,9 +32,15 @@ def build():
         with open(template_path, "r", encoding="utf-8") as f:
             html = f.read()
         html = html.replace("__ANALYSIS_DATA__", json_data)
+        # サムネイルマニフェスト (assets.py 未実行なら空)
+        thumbs_data = "{}"
+        if THUMBS_MANIFEST_PATH.exists():
+            with open(THUMBS_MANIFEST_PATH, "r", encoding="utf-8") as f:
+                thumbs_data = f.read()
+        html = html.replace("__THUMBS_DATA__", thumbs_data)
         with open(index_path, "w", encoding="utf-8") as f:
             f.write(html)
-        print("埋め込み: analysis_results.json → docs/index.html")
+        print("埋め込み: analysis_results.json, thumbs/manifest.json → docs/index.html")
 
     # マップHTMLをコピー
     map_src = OUTPUT_DIR / "restaurant_map.html"
@@ -0,0 +1,93 @@
+"""assets.py のオフライン動作確認
+
+一時ディレクトリに置いた画像をローカルの http.server で配信し、
+写真URLをそのサーバーに向けた店舗データで build_assets を実行する。
+キャッシュヒット・再実行時のスキップ・マニフェスト内容を確認する。
+
+    python check_assets.py
+"""
+
+import functools
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+from PIL import Image
+
+from assets import build_assets, cache_path, load_manifest
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    """リクエストされたパスを記録する静的ファイルハンドラ。"""
+
+    requested = []
+
+    def log_message(self, format, *args):
+        CountingHandler.requested.append(self.path)
+
+
+def start_server(directory):
+    """directory を配信するローカルサーバーを起動し (server, ベースURL) を返す。"""
+    handler = functools.partial(CountingHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/"
+
+
+def check(tmp):
+    """動作確認を実行する。失敗時は AssertionError を送出する。"""
+    srv_dir, cache_dir, thumbs_dir = tmp / "srv", tmp / "cache", tmp / "thumbs"
+    for d in (srv_dir, cache_dir, thumbs_dir):
+        d.mkdir()
+    Image.new("RGB", (640, 480), "red").save(srv_dir / "a.jpg")
+    Image.new("RGB", (640, 480), "blue").save(srv_dir / "b.jpg")
+    # 内容が a.jpg と同一の別URL
+    (srv_dir / "a_copy.jpg").write_bytes((srv_dir / "a.jpg").read_bytes())
+
+    server, base = start_server(srv_dir)
+    try:
+        df = pd.DataFrame({
+            "id": ["s1", "s2", "s3", "s4"],
+            "photo": [base + "a.jpg", base + "b.jpg", base + "a_copy.jpg", base + "a.jpg"],
+        })
+
+        # 初回: URLごとに1回だけ取得し、同一内容は1つのキャッシュファイルになる
+        manifest = build_assets(df, cache_dir, thumbs_dir, workers=4)
+        assert sorted(CountingHandler.requested) == ["/a.jpg", "/a_copy.jpg", "/b.jpg"], \
+            CountingHandler.requested
+        cached = [p for p in cache_dir.rglob("*") if p.is_file()]
+        assert len(cached) == 2, cached
+        assert manifest["s1"]["sha256"] == manifest["s3"]["sha256"] == manifest["s4"]["sha256"]
+
+        # マニフェスト内容
+        assert manifest == load_manifest(thumbs_dir)
+        assert set(manifest) == {"s1", "s2", "s3", "s4"}
+        for shop_id, url in zip(df["id"], df["photo"]):
+            entry = manifest[shop_id]
+            assert entry["photo"] == url
+            assert cache_path(entry["sha256"], cache_dir).exists()
+            assert entry["thumb"].startswith(f"{thumbs_dir.name}/")
+            assert (thumbs_dir.parent / entry["thumb"]).exists()
+
+        # 再実行: 何も取得しない
+        CountingHandler.requested.clear()
+        assert build_assets(df, cache_dir, thumbs_dir, workers=4) == manifest
+        assert CountingHandler.requested == [], CountingHandler.requested
+
+        # URL変更: 変わった店舗のみ取得し、不要になったサムネイルを削除する
+        old_thumb = thumbs_dir.parent / manifest["s2"]["thumb"]
+        df.loc[1, "photo"] = base + "a.jpg"
+        manifest = build_assets(df, cache_dir, thumbs_dir, workers=4)
+        assert CountingHandler.requested == ["/a.jpg"], CountingHandler.requested
+        assert manifest["s2"]["sha256"] == manifest["s1"]["sha256"]
+        assert not old_thumb.exists()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        check(Path(tmp))
+    print("\nassets.py オフライン動作確認: OK")
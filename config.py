@@ -26,13 +26,29 @@ SEARCH_PARAMS = {
 CENTER_LAT = 35.6580
 CENTER_LNG = 139.6994
 
+# 予算文字列の区切り文字 (正規表現の文字クラス用、全角/半角チルダ・ハイフン)
+BUDGET_SEPARATORS = "～〜~\\-ー"
+
+# データ検証: 中心座標からの許容範囲 (度、約2km)
+COORD_MAX_OFFSET = 0.02
+
 # ディレクトリパス
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 OUTPUT_DIR = BASE_DIR / "output"
 DOCS_DIR = BASE_DIR / "docs"
 CHARTS_DIR = DOCS_DIR / "charts"
+PHOTO_CACHE_DIR = DATA_DIR / "photo_cache"
+THUMBS_DIR = DOCS_DIR / "thumbs"
+THUMBS_MANIFEST_PATH = THUMBS_DIR / "manifest.json"
+
+# 店舗写真アセット
+PHOTO_DOWNLOAD_WORKERS = 8      # 同時ダウンロード数の上限
+THUMBNAIL_SIZE = (240, 180)     # サムネイル最大サイズ (幅, 高さ)
+
+# ランキングシナリオ定義
+SCENARIOS_PATH = BASE_DIR / "scenarios.json"
 
 # ディレクトリ作成
-for d in [DATA_DIR, OUTPUT_DIR, DOCS_DIR, CHARTS_DIR]:
+for d in [DATA_DIR, OUTPUT_DIR, DOCS_DIR, CHARTS_DIR, PHOTO_CACHE_DIR, THUMBS_DIR]:
     d.mkdir(exist_ok=True)
@@ -1,11 +1,13 @@
 """Google Maps連携・Foliumマップ生成"""
 
+import json
 import sys
 
 import folium
 import pandas as pd
 
-from config import DATA_DIR, OUTPUT_DIR, CENTER_LAT, CENTER_LNG
+from config import DATA_DIR, OUTPUT_DIR, CENTER_LAT, CENTER_LNG, THUMBS_MANIFEST_PATH
+from validate import validate
 
 
 def get_marker_color(budget_name):
@@ -40,6 +42,10 @@ def create_map():
     df = pd.read_csv(csv_path)
     print(f"データ読み込み: {len(df)} 件")
 
+    # 座標欠落・範囲外の店舗は検証段階で除外される
+    df, _, report = validate(df)
+    print(f"検証済み: {report['valid_rows']} 件 (隔離: {report['quarantined_rows']} 件)")
+
     # マップ初期化
     m = folium.Map(
         location=[CENTER_LAT, CENTER_LNG],
@@ -62,17 +68,22 @@ def create_map():
     """
     m.get_root().html.add_child(folium.Element(legend_html))
 
+    # サムネイル (assets.py 実行済みの場合のみ。パスは docs/ からの相対)
+    thumbs = {}
+    if THUMBS_MANIFEST_PATH.exists():
+        with open(THUMBS_MANIFEST_PATH, "r", encoding="utf-8") as f:
+            thumbs = json.load(f)
+
     # マーカー配置
     placed = 0
     for _, row in df.iterrows():
         lat = row.get("lat")
         lng = row.get("lng")
-        if pd.isna(lat) or pd.isna(lng):
-            continue
-
         color = get_marker_color(row.get("budget_name", ""))
+        thumb = thumbs.get(row.get("id"), {}).get("thumb")
         popup_html = f"""
         <div style="min-width: 200px;">
+            {'<img src="' + thumb + '" style="width: 100%; border-radius: 4px;" loading="lazy"><br>' if thumb else ''}
             <b>{row.get('name', '不明')}</b><br>
             ジャンル: {row.get('genre', '-')}<br>
             予算: {row.get('budget_name', '-')}<br>
@@ -0,0 +1,236 @@
+"""複数シナリオのランキング一括評価
+
+scenarios.json に定義したスコアリングプロファイル (重み・絞り込み条件) を
+まとめて評価する。特徴量列は1回だけ計算し、全シナリオの重みを並べた行列との
+1回の行列積で 店舗数 × シナリオ数 のスコアを求める。
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+from config import OUTPUT_DIR, SCENARIOS_PATH
+
+# ランキングに使う特徴量 (いずれも 0〜1、大きいほど高評価)
+FEATURE_COLUMNS = [
+    "rank_score",        # APIおすすめ順位
+    "capacity_score",    # 席数の多さ
+    "genre_popularity",  # ジャンル人気度
+    "budget_score",      # 予算の安さ
+    "intimacy_score",    # 席数の少なさ (落ち着き)
+]
+
+# 絞り込みに使える列 (analyze_budget と compute_features の出力)
+FILTER_COLUMNS = ["budget_min", "budget_max", "budget_mid", "capacity_num"] + FEATURE_COLUMNS
+
+RANKING_COLUMNS = ["id", "name", "genre", "budget_name", "capacity_num", "score", "access"]
+
+
+def to_json_records(df, cols):
+    """指定列をレコードのリストにする。不明値 (NaN) は JSON の null にする。"""
+    out = df[cols].astype(object)
+    return out.where(out.notna(), None).to_dict(orient="records")
+
+
+def compute_features(df):
+    """ランキング用の特徴量列を追加した DataFrame を返す。
+
+    df は analyze.analyze_budget 済み (budget_mid 列あり) であること。
+    """
+    df = df.copy()
+
+    # APIおすすめ順位スコア (index順=おすすめ順、上位ほど高スコア)
+    n = len(df)
+    df["rank_score"] = [(n - i) / n for i in range(n)]
+
+    # 席数スコア (正規化、席数不明=0)
+    # capacity_num は絞り込みで不明な店舗を除外できるよう NaN のまま残す
+    df["capacity_num"] = pd.to_numeric(df["capacity"], errors="coerce")
+    cap_max = df["capacity_num"].max()
+    df["capacity_score"] = (df["capacity_num"] / cap_max).fillna(0) if cap_max > 0 else 0.0
+
+    # 落ち着きスコア (席数の少なさの順位パーセンタイル、最少=1, 席数不明=0)
+    # 大箱の外れ値に引きずられないよう min-max ではなく順位で正規化する
+    df["intimacy_score"] = df["capacity_num"].rank(pct=True, ascending=False).fillna(0)
+
+    # ジャンル人気度スコア (そのジャンルの店舗数 / 最多ジャンル店舗数、ジャンル不明=0)
+    # NaN が残ると重み0のシナリオでもスコアが NaN になり、ランキングから外れる
+    genre_counts = df["genre"].value_counts()
+    genre_max = genre_counts.max() if len(genre_counts) > 0 else 1
+    df["genre_popularity"] = (df["genre"].map(genre_counts) / genre_max).fillna(0)
+
+    # 予算スコア (予算の安さの順位パーセンタイル、最安=1, 予算不明=0)
+    budget = pd.to_numeric(df["budget_mid"], errors="coerce")
+    df["budget_score"] = budget.rank(pct=True, ascending=False).fillna(0)
+
+    return df
+
+
+def is_range(bounds):
+    """[下限, 上限] (各要素は数値または null) の形式かを返す。"""
+    return (
+        isinstance(bounds, list)
+        and len(bounds) == 2
+        and all(
+            b is None or (isinstance(b, (int, float)) and not isinstance(b, bool))
+            for b in bounds
+        )
+    )
+
+
+def load_scenarios(path=SCENARIOS_PATH):
+    """シナリオ定義ファイルを読み込み (シナリオのリスト, top_n) を返す。"""
+    if not path.exists():
+        print(f"エラー: {path} が見つかりません。")
+        sys.exit(1)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    scenarios = data.get("scenarios", [])
+    seen = set()
+    for sc in scenarios:
+        name = sc.get("name")
+        if not name or name in seen:
+            print(f"エラー: シナリオ名が空または重複しています: {name}")
+            sys.exit(1)
+        seen.add(name)
+
+        unknown = set(sc.get("weights", {})) - set(FEATURE_COLUMNS)
+        if unknown:
+            print(f"エラー: シナリオ {name} に未知の特徴量があります: {', '.join(sorted(unknown))}")
+            sys.exit(1)
+
+        for col, bounds in sc.get("filters", {}).items():
+            if col not in FILTER_COLUMNS:
+                print(f"エラー: シナリオ {name} の絞り込み列 {col} は使用できません。")
+                sys.exit(1)
+            if not is_range(bounds):
+                print(f"エラー: シナリオ {name} の絞り込み {col} は [下限, 上限] で指定してください: {bounds}")
+                sys.exit(1)
+    return scenarios, int(data.get("top_n", 20))
+
+
+def weight_matrix(scenarios):
+    """シナリオの重みを 特徴量数 × シナリオ数 の行列にする。"""
+    weights = np.zeros((len(FEATURE_COLUMNS), len(scenarios)))
+    for j, sc in enumerate(scenarios):
+        for feature, w in sc.get("weights", {}).items():
+            weights[FEATURE_COLUMNS.index(feature), j] = w
+    return weights
+
+
+def filter_mask(df, scenarios):
+    """各シナリオの絞り込み条件を満たす行を示す 店舗数 × シナリオ数 の bool 行列を返す。
+
+    filters は {列名: [下限, 上限]} で、null は上限・下限なしを表す。
+    """
+    mask = np.ones((len(df), len(scenarios)), dtype=bool)
+    columns = {}
+    for j, sc in enumerate(scenarios):
+        for col, (lo, hi) in sc.get("filters", {}).items():
+            if col not in columns:
+                columns[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+            values = columns[col]
+            # NaN は比較が常に False になるため絞り込み時は除外される
+            if lo is not None:
+                mask[:, j] &= values >= lo
+            if hi is not None:
+                mask[:, j] &= values <= hi
+    return mask
+
+
+def score_matrix(features, weights, mask):
+    """全シナリオのスコアを1回の行列積で求める。条件外の行は -inf。"""
+    scores = features @ weights
+    return np.where(mask, scores, -np.inf)
+
+
+def evaluate_scenarios(df, scenarios, top_n=20):
+    """全シナリオのランキングを算出し {シナリオ名: {label, ranking}} を返す。
+
+    df は compute_features 済みであること。
+    """
+    features = df[FEATURE_COLUMNS].to_numpy(dtype=float)
+    scores = score_matrix(features, weight_matrix(scenarios), filter_mask(df, scenarios))
+
+    # 安定ソートで同点は元の順 (おすすめ順) を優先
+    order = np.argsort(-scores, axis=0, kind="stable")[:top_n]
+
+    # 出力用の行は1回だけ辞書化し、シナリオごとにスコアと順位を付ける
+    rows = to_json_records(df, [c for c in RANKING_COLUMNS if c != "score"])
+
+    results = {}
+    for j, sc in enumerate(scenarios):
+        idx = order[:, j]
+        idx = idx[np.isfinite(scores[idx, j])]
+        ranking = []
+        for rank, (i, score) in enumerate(zip(idx, scores[idx, j].round(3)), start=1):
+            record = {"rank": rank, **rows[i]}
+            record["score"] = float(score)
+            ranking.append({c: record[c] for c in ["rank"] + RANKING_COLUMNS})
+        results[sc["name"]] = {
+            "label": sc.get("label", sc["name"]),
+            "weights": sc.get("weights", {}),
+            "filters": sc.get("filters", {}),
+            "ranking": ranking,
+        }
+    return results
+
+
+def benchmark_scenarios(df, counts=(1, 10, 100, 500), top_n=20, seed=0):
+    """ランダムな重みのシナリオ数を変えて評価時間を計測する。"""
+    rng = np.random.default_rng(seed)
+    timings = []
+    for count in counts:
+        scenarios = [
+            {
+                "name": f"bench_{i}",
+                "weights": dict(zip(FEATURE_COLUMNS, rng.dirichlet(np.ones(len(FEATURE_COLUMNS))))),
+                "filters": {"budget_mid": [0, int(rng.integers(2000, 20000))]},
+            }
+            for i in range(count)
+        ]
+        start = time.perf_counter()
+        evaluate_scenarios(df, scenarios, top_n)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        timings.append({
+            "scenarios": count,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "per_scenario_ms": round(elapsed_ms / count, 3),
+        })
+    return timings
+
+
+def save_benchmark(timings):
+    """評価時間をJSONに保存する (公開用の分析結果には含めない)。"""
+    json_path = OUTPUT_DIR / "scenario_timing.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(timings, f, ensure_ascii=False, indent=2)
+    print(f"評価時間保存: {json_path}")
+
+
+def display_benchmark(timings):
+    """シナリオ数ごとの評価時間を表示する。"""
+    print("\n■ シナリオ評価時間")
+    print(tabulate(timings, headers="keys", tablefmt="simple"))
+
+
+if __name__ == "__main__":
+    from analyze import load_data, analyze_budget
+
+    df = load_data()
+    df, _ = analyze_budget(df)
+    df = compute_features(df)
+    scenarios, top_n = load_scenarios()
+    results = evaluate_scenarios(df, scenarios, top_n)
+    for name, res in results.items():
+        print(f"\n■ {res['label']} ({name}) Top5")
+        top5 = [[r["rank"], r["name"], r["genre"], r["budget_name"], r["score"]] for r in res["ranking"][:5]]
+        print(tabulate(top5, headers=["順位", "店名", "ジャンル", "予算", "スコア"], tablefmt="simple"))
+    timings = benchmark_scenarios(df, top_n=top_n)
+    display_benchmark(timings)
+    save_benchmark(timings)
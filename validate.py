@@ -0,0 +1,139 @@
+"""スキーマ検証・データ品質チェック
+
+CSV読み込み直後に列単位のベクトル演算で全行を検証する。
+隔離対象ルールに違反した行は data/quarantine.csv に退避し、
+ルールごとの違反件数をデータ品質レポートとして出力する。
+"""
+
+import json
+import sys
+import time
+
+import pandas as pd
+from tabulate import tabulate
+
+from config import (
+    DATA_DIR,
+    OUTPUT_DIR,
+    CENTER_LAT,
+    CENTER_LNG,
+    COORD_MAX_OFFSET,
+    BUDGET_SEPARATORS,
+)
+
+# collect.extract_shop_data が出力する列
+REQUIRED_COLUMNS = [
+    "id", "name", "address", "lat", "lng", "genre", "genre_code",
+    "budget_code", "budget_name", "budget_average", "capacity",
+    "access", "url", "photo",
+]
+
+# ルール名 → 違反行を隔離するか (False は件数の報告のみ)
+RULES = {
+    "missing_id": True,
+    "duplicate_id": True,
+    "missing_coords": True,
+    "coords_out_of_bounds": True,
+    "budget_unparsable": False,
+    "capacity_not_numeric": False,
+}
+
+# analyze.parse_budget_range と同じ区切り文字で分割した各部分のうち、
+# 数字を含むものの数を数える (1 または 2 ならパース成功)
+BUDGET_PART_PATTERN = rf"(?:^|[{BUDGET_SEPARATORS}])[^{BUDGET_SEPARATORS}]*\d"
+
+
+def check_schema(df):
+    """必須列の欠落を返す。"""
+    return [c for c in REQUIRED_COLUMNS if c not in df.columns]
+
+
+def check_rows(df):
+    """各ルールの違反フラグを列に持つ bool の DataFrame を返す。"""
+    ids = df["id"].astype("string").str.strip()
+    lat = pd.to_numeric(df["lat"], errors="coerce")
+    lng = pd.to_numeric(df["lng"], errors="coerce")
+    budget_parts = df["budget_name"].astype("string").str.count(BUDGET_PART_PATTERN)
+    capacity = pd.to_numeric(df["capacity"], errors="coerce")
+
+    missing_coords = lat.isna() | lng.isna()
+    in_bounds = ((lat - CENTER_LAT).abs() <= COORD_MAX_OFFSET) & (
+        (lng - CENTER_LNG).abs() <= COORD_MAX_OFFSET
+    )
+
+    return pd.DataFrame({
+        "missing_id": (ids.isna() | (ids == "")).astype(bool),
+        "duplicate_id": ids.notna() & ids.duplicated(keep="first"),
+        "missing_coords": missing_coords,
+        "coords_out_of_bounds": ~missing_coords & ~in_bounds,
+        "budget_unparsable": ~budget_parts.isin([1, 2]).astype(bool),
+        "capacity_not_numeric": capacity.isna(),
+    }, index=df.index)[list(RULES)]
+
+
+def validate(df):
+    """データを検証し (隔離後のDataFrame, 隔離行, 品質レポート) を返す。
+
+    必須列が欠けている場合は後続処理が成り立たないため終了する。
+    """
+    start = time.perf_counter()
+
+    missing = check_schema(df)
+    if missing:
+        print(f"エラー: 必須列がありません: {', '.join(missing)}")
+        sys.exit(1)
+
+    flags = check_rows(df)
+    quarantine_rules = [rule for rule, quarantine in RULES.items() if quarantine]
+    bad = flags[quarantine_rules].any(axis=1)
+
+    quarantined = df[bad].copy()
+    quarantined["failed_rules"] = (
+        flags.loc[bad, quarantine_rules].dot(pd.Index(quarantine_rules) + ";").str.rstrip(";")
+    )
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    report = {
+        "total_rows": int(len(df)),
+        "valid_rows": int((~bad).sum()),
+        "quarantined_rows": int(bad.sum()),
+        "rules": [
+            {"rule": rule, "quarantine": quarantine, "count": int(flags[rule].sum())}
+            for rule, quarantine in RULES.items()
+        ],
+        "elapsed_ms": round(elapsed_ms, 2),
+    }
+    return df[~bad].reset_index(drop=True), quarantined, report
+
+
+def display_report(report):
+    """データ品質レポートをターミナルに表示する。"""
+    print("\n■ データ品質チェック")
+    print(
+        f"  有効: {report['valid_rows']} / {report['total_rows']} 件"
+        f" (隔離: {report['quarantined_rows']} 件, {report['elapsed_ms']} ms)"
+    )
+    print(tabulate(report["rules"], headers="keys", tablefmt="simple"))
+
+
+def save_report(report, quarantined):
+    """品質レポートをJSONに、隔離行をCSVに保存する。"""
+    json_path = OUTPUT_DIR / "data_quality.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"品質レポート保存: {json_path}")
+
+    csv_path = DATA_DIR / "quarantine.csv"
+    quarantined.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    print(f"隔離データ保存: {csv_path}")
+
+
+if __name__ == "__main__":
+    csv_path = DATA_DIR / "restaurants.csv"
+    if not csv_path.exists():
+        print(f"エラー: {csv_path} が見つかりません。先に collect.py を実行してください。")
+        sys.exit(1)
+
+    df, quarantined, report = validate(pd.read_csv(csv_path))
+    display_report(report)
+    save_report(report, quarantined)
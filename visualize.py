@@ -12,6 +12,7 @@ import numpy as np
 import pandas as pd
 
 from config import DATA_DIR, OUTPUT_DIR
+from validate import validate
 
 
 def setup_font():
@@ -37,7 +38,7 @@ def load_data():
         print(f"エラー: {csv_path} が見つかりません。")
         sys.exit(1)
 
-    df = pd.read_csv(csv_path)
+    df, _, _ = validate(pd.read_csv(csv_path))
 
     results = None
     if json_path.exists():